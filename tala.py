@@ -4,16 +4,30 @@ Licence: BSD 3 clauses (see https://opensource.org/licenses/BSD-3-Clause)
 Auteur: Hubert Tournier
 """
 
+import concurrent.futures
+import contextlib
 import csv
 import datetime
+import functools
 import getopt
+import hashlib
+import io
+import ipaddress
 import json
 import logging
+import math
+import operator
 import os
 import pprint
+import queue
 import re
 import signal
+import socket
+import socketserver
 import sys
+import tempfile
+import threading
+import zlib
 
 # Chaîne de version utilisée par les commandes what(1) et ident(1) :
 ID = "@(#) $Id: tala - Teams Audit Log Analyzer v3.0.0 (12 Avril 2024) par Hubert Tournier $"
@@ -24,12 +38,83 @@ parametres = {
     "Lister organisateurs": False,
     "Lister participants": False,
     "Lister deconnexions": False,
+    "Resume approximatif": False,
+    "Regroupement": [],
+    "Mesures": ["count"],
     "Base utilisateurs": "",
     "Filtre adresses": None,
+    "Ecart reconnexion": 300,
+    "Intervalle incidents": 300,
+    "Partitions": 1,
+    "Decodeurs": 0,
+    "Socket serveur": "",
+    "Socket client": "",
 }
 
+# Marqueur de la ligne d'état JSON terminant chaque réponse du serveur :
+FIN_REPONSE = "\0"
+
+# Paramètres transmis par un client au serveur pour chaque requête :
+PARAMETRES_REQUETE = (
+    "Afficher contenu",
+    "Lister organisateurs",
+    "Lister participants",
+    "Lister deconnexions",
+    "Resume approximatif",
+    "Regroupement",
+    "Mesures",
+    "Filtre adresses",
+    "Ecart reconnexion",
+    "Intervalle incidents",
+    "Partitions",
+    "Decodeurs",
+)
+
 DELIMITER = ","
 
+# Noms possibles des colonnes utilisées, anciens noms compris :
+COLONNES = {
+    "CreationDate": ("CreationDate",),
+    "UserId": ("UserId", "UserIds", "UsedIds"),
+    "Operation": ("Operation", "Operations"),
+    "AuditData": ("AuditData",),
+}
+
+# Taille du tampon de lecture des fichiers :
+TAILLE_TAMPON = 1024 * 1024
+
+# Nombre de lignes par lot en mode de décodage parallèle :
+TAILLE_LOT = 1000
+
+# Champs des connexions utilisables pour les regroupements, avec leur nom en colonne :
+CHAMPS_REGROUPEMENT = {
+    "meeting_id": "id_reunion",
+    "organizer_email": "email_organisateur",
+    "organizer_id": "id_organisateur",
+    "organizer_organization": "id_organisation_organisateur",
+    "meeting_type": "type_reunion",
+    "attendee_key": "cle_participant",
+    "key_type": "type_cle",
+    "attendee_organization": "id_organisation_participant",
+    "join_time": "debut",
+    "leave_time": "fin",
+    "client_ip": "adresse_ip",
+    "device": "materiel",
+    "property": "propriete",
+}
+
+# Nombre maximal de groupes (organisations, matériels) des statistiques approximatives,
+# les suivants étant cumulés sous AUTRES_GROUPES pour garder une mémoire fixe :
+NOMBRE_MAX_GROUPES = 100
+AUTRES_GROUPES = "(others)"
+
+# Mesures calculables pour chaque groupe :
+MESURES = ("count", "distinct", "sum_duration")
+
+# Nombre minimal de participants déconnectés dans un même sous-réseau et
+# une même tranche horaire pour signaler un incident :
+SEUIL_INCIDENT = 2
+
 ################################################################################
 def _initialisation_journalisation(nom_programme):
     """ Configuration de la journalisation """
@@ -43,8 +128,11 @@ def _afficher_aide():
     print(file=sys.stderr)
     print("usage: tala [--debug] [--help|-?] [--version]", file=sys.stderr)
     print("       [-o|--organizers] [-a|--attendees]", file=sys.stderr)
-    print("       [-u|--users FILE]", file=sys.stderr)
+    print("       [-u|--users FILE] [-p|--partitions NUMBER] [-j|--jobs NUMBER]", file=sys.stderr)
     print("       [-d|--disconnect] [-i|--ip REGEX]", file=sys.stderr)
+    print("       [-g|--gap SECONDS] [-b|--bucket SECONDS]", file=sys.stderr)
+    print("       [--approx] [--group-by FIELDS [--metrics METRICS]]", file=sys.stderr)
+    print("       [--serve SOCKET|--connect SOCKET]", file=sys.stderr)
     print("       [--] [file ...]", file=sys.stderr)
     print(
         "  ---------------  -------------------------------------------------",
@@ -54,7 +142,16 @@ def _afficher_aide():
     print("  -a|--attendees   List meetings attendees", file=sys.stderr)
     print("  -d|--disconnect  List meetings disconnections", file=sys.stderr)
     print("  -i|--ip REGEX    Filter meeting disconnections by IP address regex", file=sys.stderr)
+    print("  -g|--gap SECS    Max delay before a reconnection is suspect (def: 300)", file=sys.stderr)
+    print("  -b|--bucket SECS Time slice for grouping incidents by subnet (def: 300)", file=sys.stderr)
+    print("  --approx         Print approximate statistics in fixed memory", file=sys.stderr)
+    print("  --group-by FIELDS  Summarize connections grouped by comma-separated FIELDS", file=sys.stderr)
+    print("  --metrics METRICS  Comma-separated group METRICS (def: count)", file=sys.stderr)
     print("  -u|--users FILE  create/update and use the FILE users database", file=sys.stderr)
+    print("  -p|--partitions N Spill data to N temporary files to save memory", file=sys.stderr)
+    print("  -j|--jobs N      Decode data with N workers in a pipeline", file=sys.stderr)
+    print("  --serve SOCKET   Run as a server listening on the SOCKET Unix socket", file=sys.stderr)
+    print("  --connect SOCKET Send processing to the server listening on SOCKET", file=sys.stderr)
     print("  --debug          Enable debug mode", file=sys.stderr)
     print("  --help|-?        Print usage and this help message and exit", file=sys.stderr)
     print("  --version        Print version and exit", file=sys.stderr)
@@ -81,14 +178,23 @@ def _gestion_ligne_commande():
     # pylint: enable=C0103
 
     # Options reconnues :
-    lettres_options = "adi:ou:?"
+    lettres_options = "ab:dg:i:j:op:u:?"
     chaines_options = [
+        "approx",
         "attendees",
+        "bucket=",
+        "connect=",
         "debug",
         "disconnect",
+        "gap=",
+        "group-by=",
         "help",
         "ip=",
+        "jobs=",
+        "metrics=",
         "organizers",
+        "partitions=",
+        "serve=",
         "users=",
         "version",
     ]
@@ -109,12 +215,56 @@ def _gestion_ligne_commande():
             parametres["Lister organisateurs"] = False
             parametres["Lister participants"] = True
             parametres["Lister deconnexions"] = False
+            parametres["Resume approximatif"] = False
+            parametres["Regroupement"] = []
+
+        elif option == "--approx":
+            parametres["Afficher contenu"] = False
+            parametres["Lister organisateurs"] = False
+            parametres["Lister participants"] = False
+            parametres["Lister deconnexions"] = False
+            parametres["Resume approximatif"] = True
+            parametres["Regroupement"] = []
+
+        elif option in ("-b", "--bucket"):
+            try:
+                parametres["Intervalle incidents"] = int(argument)
+            except ValueError:
+                logging.critical("'%s' is not an integer", argument)
+                sys.exit(1)
+            if parametres["Intervalle incidents"] <= 0:
+                logging.critical("The bucket duration must be strictly positive")
+                sys.exit(1)
 
         elif option in ("-d", "--disconnect"):
             parametres["Afficher contenu"] = False
             parametres["Lister organisateurs"] = False
             parametres["Lister participants"] = False
             parametres["Lister deconnexions"] = True
+            parametres["Resume approximatif"] = False
+            parametres["Regroupement"] = []
+
+        elif option in ("-g", "--gap"):
+            try:
+                parametres["Ecart reconnexion"] = int(argument)
+            except ValueError:
+                logging.critical("'%s' is not an integer", argument)
+                sys.exit(1)
+            if parametres["Ecart reconnexion"] < 0:
+                logging.critical("The reconnection gap must be positive")
+                sys.exit(1)
+
+        elif option == "--group-by":
+            parametres["Afficher contenu"] = False
+            parametres["Lister organisateurs"] = False
+            parametres["Lister participants"] = False
+            parametres["Lister deconnexions"] = False
+            parametres["Resume approximatif"] = False
+            parametres["Regroupement"] = argument.split(",")
+            for champ in parametres["Regroupement"]:
+                if champ not in CHAMPS_REGROUPEMENT:
+                    logging.critical("'%s' is not a field name. Use one of: %s", champ, ", ".join(CHAMPS_REGROUPEMENT))
+                    sys.exit(1)
 
         elif option in ("-i", "--ip"):
             try:
@@ -123,15 +273,50 @@ def _gestion_ligne_commande():
                 logging.critical("'%s' is not a regular expression", argument)
                 sys.exit(1)
 
+        elif option in ("-j", "--jobs"):
+            try:
+                parametres["Decodeurs"] = int(argument)
+            except ValueError:
+                logging.critical("'%s' is not an integer", argument)
+                sys.exit(1)
+            if parametres["Decodeurs"] < 0:
+                logging.critical("The number of jobs must be positive")
+                sys.exit(1)
+
+        elif option == "--metrics":
+            parametres["Mesures"] = argument.split(",")
+            for mesure in parametres["Mesures"]:
+                if mesure not in MESURES:
+                    logging.critical("'%s' is not a metric name. Use one of: %s", mesure, ", ".join(MESURES))
+                    sys.exit(1)
+
         elif option in ("-o", "--organizers"):
             parametres["Afficher contenu"] = False
             parametres["Lister organisateurs"] = True
             parametres["Lister participants"] = False
             parametres["Lister deconnexions"] = False
+            parametres["Resume approximatif"] = False
+            parametres["Regroupement"] = []
+
+        elif option in ("-p", "--partitions"):
+            try:
+                parametres["Partitions"] = int(argument)
+            except ValueError:
+                logging.critical("'%s' is not an integer", argument)
+                sys.exit(1)
+            if parametres["Partitions"] <= 0:
+                logging.critical("The number of partitions must be strictly positive")
+                sys.exit(1)
 
         elif option in ("-u", "--users"):
             parametres["Base utilisateurs"] = argument
 
+        elif option == "--connect":
+            parametres["Socket client"] = argument
+
+        elif option == "--serve":
+            parametres["Socket serveur"] = argument
+
         elif option == "--debug":
             logging.disable(logging.NOTSET)
 
@@ -143,145 +328,441 @@ def _gestion_ligne_commande():
             print(ID.replace("@(" + "#)" + " $" + "Id" + ": ", "").replace(" $", ""))
             sys.exit(0)
 
+    if parametres["Socket serveur"] or parametres["Socket client"]:
+        if not hasattr(socket, "AF_UNIX"):
+            logging.critical("Unix sockets are not available on this system")
+            sys.exit(1)
+        if parametres["Socket serveur"] and parametres["Socket client"]:
+            logging.critical("The --serve and --connect options are mutually exclusive")
+            sys.exit(1)
+
     return arguments_restants
 
 ################################################################################
+@functools.lru_cache(maxsize=65536)
 def convertir_secondes(chaine):
     """ Retourne le nombre de secondes écoulées depuis l'Epoch à partir d'une chaîne de date """
     return datetime.datetime.strptime(chaine, "%Y-%m-%dT%H:%M:%S").timestamp()
 
 ################################################################################
-def extraire_reunions(fichier, afficher):
-    """ Retourne des structures contenant la liste des réunions/organisateurs et des participants
-        Vérifie au passage la présence de valeurs inhabituelles dans les champs """
-    organisateurs = {}
-    participants = {}
+@functools.lru_cache(maxsize=4096)
+def normaliser_propriete(valeur):
+    """ Retourne la forme abrégée d'un agent utilisateur """
+    propriete = re.sub(r" \(.*", "", valeur)
+    propriete = re.sub(r"SkypeSpaces.*", "SkypeSpaces", propriete)
+    return re.sub(r"^[0-9].*", "Some Agent", propriete)
 
-    numero_ligne = 1
-    lignes = csv.DictReader(fichier, delimiter=DELIMITER)
-    for ligne in lignes:
-        if ligne["Operation"] != "MeetingParticipantDetail":
-            logging.warning(f"Ligne {numero_ligne} : 'Operation' différent de 'MeetingParticipantDetail' : {ligne['Operation']}")
-
-        details = json.loads(ligne["AuditData"])
-
-        if afficher:
-            print(f"Line #{numero_ligne}")
-            print(f"CreationDate={ligne['CreationDate']}")
-            print(f"UserId={ligne['UserId']}")
-            print(f"Operation={ligne['Operation']}")
-            print("AuditData:")
-            pprint.pprint(details, compact=False, sort_dicts=False)
-            if "Operation" in details and details["Operation"] != "MeetingParticipantDetail":
-                logging.info(f"Ligne {numero_ligne} : 'Operation' différent de 'MeetingParticipantDetail': {details['Operation']}")
-            if "Workload" in details and details["Workload"] != "MicrosoftTeams":
-                logging.info(f"Ligne {numero_ligne} : 'Workload' différent de 'MicrosoftTeams': {details['Workload']}")
-            if "ArtifactSharedName" in details and details["ArtifactSharedName"] != "videoTransmitted":
-                logging.info("Ligne {numero_ligne} : 'ArtifactSharedName' différent de 'videoTransmitted': {details['ArtifactSharedName']}")
-            if "Key" in details and details["Key"] != "UserAgent":
-                logging.info(f"Ligne {numero_ligne} : 'Key' différent de 'UserAgent': {details['Key']}")
-            if "RecipientType" in details and details["RecipientType"] not in ("User", "Anonymous", "Applications", "Phone"):
-                logging.info(f"Ligne {numero_ligne} : 'RecipientType' différent des valeurs connues: {details['RecipientType']}")
-            if "ItemName" in details and details["ItemName"] not in ("ScheduledMeeting", "RecurringMeeting", "Escalation", "AdHocMeeting", "ChannelMeeting", "MicrosoftTeams", "Complete", "Broadcast", "ScreenSharingCall", "31"):
-                logging.info(f"Ligne {numero_ligne} : 'ItemName' différent des valeurs connues: {details['ItemName']}")
-            if "RecordType" in details and details["RecordType"] != 25:
-                logging.info(f"Ligne {numero_ligne} : 'RecordType' différent de 25: {details['RecordType']}")
-            if "UserType" in details and details["UserType"] != 0:
-                logging.info(f"Ligne {numero_ligne} : 'UserType' différent de 0: {details['UserType']}")
-            if "Version" in details and details["Version"] != 1:
-                logging.info(f"Ligne {numero_ligne} : 'Version' différent de 1: {details['Version']}")
-            print()
-
-        id_reunion = ""
-        if "MeetingDetailId" in details:
-            id_reunion = details["MeetingDetailId"]
-        else:
-            logging.warning(f"Ligne {numero_ligne} : 'MeetingDetailId' absent")
+################################################################################
+class Connexion:
+    """ Connexion d'un participant à une réunion, extraite d'une ligne du journal d'audit """
+    __slots__ = (
+        "numero_ligne",
+        "id_reunion",
+        "email_organisateur",
+        "id_organisateur",
+        "id_organisation_organisateur",
+        "type_reunion",
+        "type_cle",
+        "cle_participant",
+        "id_organisation_participant",
+        "propriete",
+        "debut",
+        "fin",
+        "adresse_ip",
+        "materiel",
+    )
 
-        email_organisateur = ""
-        if "UserId" in details:
-            email_organisateur = details["UserId"]
-        else:
-            logging.info(f"Ligne {numero_ligne} : 'UserId' absent")
+    def __init__(
+        self,
+        numero_ligne,
+        id_reunion,
+        email_organisateur,
+        id_organisateur,
+        id_organisation_organisateur,
+        type_reunion,
+        type_cle,
+        cle_participant,
+        id_organisation_participant,
+        propriete,
+        debut,
+        fin,
+        adresse_ip,
+        materiel
+    ):
+        self.numero_ligne = numero_ligne
+        self.id_reunion = id_reunion
+        self.email_organisateur = email_organisateur
+        self.id_organisateur = id_organisateur
+        self.id_organisation_organisateur = id_organisation_organisateur
+        self.type_reunion = type_reunion
+        self.type_cle = type_cle
+        self.cle_participant = cle_participant
+        self.id_organisation_participant = id_organisation_participant
+        self.propriete = propriete
+        self.debut = debut
+        self.fin = fin
+        self.adresse_ip = adresse_ip
+        self.materiel = materiel
+
+    def __repr__(self):
+        return "Connexion(" + ", ".join(f"{champ}={getattr(self, champ)!r}" for champ in self.__slots__) + ")"
 
-        id_organisateur = ""
-        if "UserKey" in details:
-            id_organisateur = details["UserKey"]
-        else:
-            logging.info(f"Ligne {numero_ligne} : 'UserKey' absent")
+################################################################################
+def decoder_ligne(numero_ligne, creation, utilisateur, operation, donnees_audit, afficher, journal=logging):
+    """ Retourne la connexion décrite par une ligne du journal d'audit
+        Vérifie au passage la présence de valeurs inhabituelles dans les champs,
+        en les signalant via 'journal' (le module logging ou un JournalDiffere) """
+    if operation != "MeetingParticipantDetail":
+        journal.warning(f"Ligne {numero_ligne} : 'Operation' différent de 'MeetingParticipantDetail' : {operation}")
+
+    details = json.loads(donnees_audit)
+
+    if afficher:
+        print(f"Line #{numero_ligne}")
+        print(f"CreationDate={creation}")
+        print(f"UserId={utilisateur}")
+        print(f"Operation={operation}")
+        print("AuditData:")
+        pprint.pprint(details, compact=False, sort_dicts=False)
+        if "Operation" in details and details["Operation"] != "MeetingParticipantDetail":
+            journal.info(f"Ligne {numero_ligne} : 'Operation' différent de 'MeetingParticipantDetail': {details['Operation']}")
+        if "Workload" in details and details["Workload"] != "MicrosoftTeams":
+            journal.info(f"Ligne {numero_ligne} : 'Workload' différent de 'MicrosoftTeams': {details['Workload']}")
+        if "ArtifactSharedName" in details and details["ArtifactSharedName"] != "videoTransmitted":
+            journal.info("Ligne {numero_ligne} : 'ArtifactSharedName' différent de 'videoTransmitted': {details['ArtifactSharedName']}")
+        if "Key" in details and details["Key"] != "UserAgent":
+            journal.info(f"Ligne {numero_ligne} : 'Key' différent de 'UserAgent': {details['Key']}")
+        if "RecipientType" in details and details["RecipientType"] not in ("User", "Anonymous", "Applications", "Phone"):
+            journal.info(f"Ligne {numero_ligne} : 'RecipientType' différent des valeurs connues: {details['RecipientType']}")
+        if "ItemName" in details and details["ItemName"] not in ("ScheduledMeeting", "RecurringMeeting", "Escalation", "AdHocMeeting", "ChannelMeeting", "MicrosoftTeams", "Complete", "Broadcast", "ScreenSharingCall", "31"):
+            journal.info(f"Ligne {numero_ligne} : 'ItemName' différent des valeurs connues: {details['ItemName']}")
+        if "RecordType" in details and details["RecordType"] != 25:
+            journal.info(f"Ligne {numero_ligne} : 'RecordType' différent de 25: {details['RecordType']}")
+        if "UserType" in details and details["UserType"] != 0:
+            journal.info(f"Ligne {numero_ligne} : 'UserType' différent de 0: {details['UserType']}")
+        if "Version" in details and details["Version"] != 1:
+            journal.info(f"Ligne {numero_ligne} : 'Version' différent de 1: {details['Version']}")
+        print()
+
+    id_reunion = ""
+    if "MeetingDetailId" in details:
+        id_reunion = details["MeetingDetailId"]
+    else:
+        journal.warning(f"Ligne {numero_ligne} : 'MeetingDetailId' absent")
 
-        id_organisation_organisateur = ""
-        if "OrganizationId" in details:
-            id_organisation_organisateur = details["OrganizationId"]
-        else:
-            logging.info(f"Ligne {numero_ligne} : 'OrganizationId' absent")
+    email_organisateur = ""
+    if "UserId" in details:
+        email_organisateur = details["UserId"]
+    else:
+        journal.info(f"Ligne {numero_ligne} : 'UserId' absent")
 
-        type_reunion = ""
-        if "ItemName" in details:
-            type_reunion = details["ItemName"]
-        else:
-            logging.info(f"Ligne {numero_ligne} : 'ItemName' absent")
-
-        type_cle = ""
-        id_participant = ""
-        libelle_participant = ""
-        cle_participant = ""
-        id_organisation_participant = ""
-        if "Attendees" in details:
-            if len(details["Attendees"]) == 1:
-                if "RecipientType" in details["Attendees"][0]:
-                    type_cle = details["Attendees"][0]["RecipientType"]
-                else:
-                    type_cle = "?"
+    id_organisateur = ""
+    if "UserKey" in details:
+        id_organisateur = details["UserKey"]
+    else:
+        journal.info(f"Ligne {numero_ligne} : 'UserKey' absent")
 
-                if "UserObjectId" in details["Attendees"][0]:
-                    id_participant = details["Attendees"][0]["UserObjectId"]
-                    cle_participant = id_participant
+    id_organisation_organisateur = ""
+    if "OrganizationId" in details:
+        id_organisation_organisateur = details["OrganizationId"]
+    else:
+        journal.info(f"Ligne {numero_ligne} : 'OrganizationId' absent")
 
-                    if "OrganizationId" in details["Attendees"][0]:
-                        id_organisation_participant = details["Attendees"][0]["OrganizationId"]
+    type_reunion = ""
+    if "ItemName" in details:
+        type_reunion = details["ItemName"]
+    else:
+        journal.info(f"Ligne {numero_ligne} : 'ItemName' absent")
+
+    type_cle = ""
+    id_participant = ""
+    libelle_participant = ""
+    cle_participant = ""
+    id_organisation_participant = ""
+    if "Attendees" in details:
+        if len(details["Attendees"]) == 1:
+            if "RecipientType" in details["Attendees"][0]:
+                type_cle = details["Attendees"][0]["RecipientType"]
+            else:
+                type_cle = "?"
 
-                elif "DisplayName" in details["Attendees"][0]:
-                    libelle_participant = details["Attendees"][0]["DisplayName"].replace(DELIMITER, " ")
-                    cle_participant = libelle_participant
-                else:
-                    logging.warning(f"Ligne {numero_ligne} : 'Attendees/UserObjectid' et 'Attendees/DisplayName' absents")
+            if "UserObjectId" in details["Attendees"][0]:
+                id_participant = details["Attendees"][0]["UserObjectId"]
+                cle_participant = id_participant
+
+                if "OrganizationId" in details["Attendees"][0]:
+                    id_organisation_participant = details["Attendees"][0]["OrganizationId"]
+
+            elif "DisplayName" in details["Attendees"][0]:
+                libelle_participant = details["Attendees"][0]["DisplayName"].replace(DELIMITER, " ")
+                cle_participant = libelle_participant
             else:
-                logging.warning(f"Ligne {numero_ligne} : 'Attendees' contient plus de {len(details['Attendees'])} participants au lieu de 1")
-        else:
-            logging.warning(f"Ligne {numero_ligne} : 'Attendees' absent")
-
-        propriete = ""
-        if "ExtraProperties" in details:
-            if "Value" in details["ExtraProperties"]:
-                propriete = details["ExtraProperties"]["Value"]
-                propriete = re.sub(r" \(.*", "", propriete)
-                propriete = re.sub(r"SkypeSpaces.*", "SkypeSpaces", propriete)
-                propriete = re.sub(r"^[0-9].*", "Some Agent", propriete)
-
-        debut = ""
-        if "JoinTime" in details:
-            debut = details["JoinTime"]
+                journal.warning(f"Ligne {numero_ligne} : 'Attendees/UserObjectid' et 'Attendees/DisplayName' absents")
         else:
-            logging.warning(f"Ligne {numero_ligne} : 'JoinTime' absent")
+            journal.warning(f"Ligne {numero_ligne} : 'Attendees' contient plus de {len(details['Attendees'])} participants au lieu de 1")
+    else:
+        journal.warning(f"Ligne {numero_ligne} : 'Attendees' absent")
 
-        fin = ""
-        if "LeaveTime" in details:
-            fin = details["LeaveTime"]
-        else:
-            logging.warning(f"Ligne {numero_ligne} : 'LeaveTime' absent")
+    propriete = ""
+    if "ExtraProperties" in details:
+        if "Value" in details["ExtraProperties"]:
+            propriete = normaliser_propriete(details["ExtraProperties"]["Value"])
+
+    debut = ""
+    if "JoinTime" in details:
+        debut = details["JoinTime"]
+    else:
+        journal.warning(f"Ligne {numero_ligne} : 'JoinTime' absent")
+
+    fin = ""
+    if "LeaveTime" in details:
+        fin = details["LeaveTime"]
+    else:
+        journal.warning(f"Ligne {numero_ligne} : 'LeaveTime' absent")
+
+    adresse_ip = ""
+    if "ClientIP" in details:
+        adresse_ip = details["ClientIP"]
+    else:
+        journal.info(f"Ligne {numero_ligne} : 'ClientIP' absent")
+
+    materiel = ""
+    if "DeviceInformation" in details:
+        materiel = details["DeviceInformation"].replace(DELIMITER, " ")
+    else:
+        journal.info(f"Ligne {numero_ligne} : 'DeviceInformation' absent")
+
+    return Connexion(
+        numero_ligne,
+        id_reunion,
+        email_organisateur,
+        id_organisateur,
+        id_organisation_organisateur,
+        type_reunion,
+        type_cle,
+        cle_participant,
+        id_organisation_participant,
+        propriete,
+        debut,
+        fin,
+        adresse_ip,
+        materiel,
+    )
+
+################################################################################
+class EnteteIncorrecte(ValueError):
+    """ Ligne d'entête d'un journal d'audit sans les colonnes attendues """
 
-        adresse_ip = ""
-        if "ClientIP" in details:
-            adresse_ip = details["ClientIP"]
+################################################################################
+def indexer_colonnes(entete):
+    """ Retourne les positions des colonnes CreationDate, UserId, Operation et AuditData dans l'entête """
+    if entete:
+        entete = [entete[0].lstrip("\ufeff")] + entete[1:]
+
+    indices = []
+    for colonne, noms in COLONNES.items():
+        for nom in noms:
+            if nom in entete:
+                indices.append(entete.index(nom))
+                break
         else:
-            logging.info(f"Ligne {numero_ligne} : 'ClientIP' absent")
+            raise EnteteIncorrecte(f"'{colonne}' column not found in header line")
+    return indices
+
+################################################################################
+class JournalDiffere:
+    """ Journal mémorisant des messages pour les émettre plus tard, dans leur ordre d'origine """
+
+    def __init__(self):
+        self.messages = []
+
+    def warning(self, message):
+        """ Mémorise un avertissement """
+        self.messages.append((logging.WARNING, message))
+
+    def info(self, message):
+        """ Mémorise une information """
+        self.messages.append((logging.INFO, message))
 
-        materiel = ""
-        if "DeviceInformation" in details:
-            materiel = details["DeviceInformation"].replace(DELIMITER, " ")
+################################################################################
+def _decoder_champs(numero_ligne, ligne, indices, afficher, journal=logging):
+    """ Retourne la connexion décrite par les champs d'une ligne, ou None si la ligne est incomplète """
+    i_creation, i_utilisateur, i_operation, i_audit = indices
+    if len(ligne) <= max(indices):
+        journal.warning(f"Ligne {numero_ligne} : {len(ligne)} champs au lieu d'au moins {max(indices) + 1}")
+        return None
+
+    return decoder_ligne(
+        numero_ligne,
+        ligne[i_creation],
+        ligne[i_utilisateur],
+        ligne[i_operation],
+        ligne[i_audit],
+        afficher,
+        journal
+    )
+
+################################################################################
+def _decoder_lot(lot, indices):
+    """ Décode un lot de lignes numérotées et retourne, pour chaque ligne, un triplet
+        (messages, connexion, erreur) : les messages émis lors de son décodage, la connexion
+        sous forme de tuple (moins coûteux à transmettre entre processus) ou None, et l'exception
+        rencontrée ou None. Le décodage du lot s'arrête à la première exception """
+    journal = JournalDiffere()
+    resultats = []
+    champs = operator.attrgetter(*Connexion.__slots__)
+    for numero_ligne, ligne in lot:
+        journal.messages = []
+        try:
+            connexion = _decoder_champs(numero_ligne, ligne, indices, False, journal)
+        except Exception as erreur: # pylint: disable=W0703
+            # L'erreur est retransmise au consommateur après les lignes précédentes :
+            resultats.append((journal.messages, None, erreur))
+            break
+        if connexion is None:
+            resultats.append((journal.messages, None, None))
         else:
-            logging.info(f"Ligne {numero_ligne} : 'DeviceInformation' absent")
+            resultats.append((journal.messages, champs(connexion), None))
+    return resultats
+
+################################################################################
+def _deposer(file_lots, element, arret):
+    """ Dépose un élément dans une file bornée, sauf si l'arrêt est demandé entre-temps """
+    while not arret.is_set():
+        try:
+            file_lots.put(element, timeout=0.1)
+            return True
+        except queue.Full:
+            pass
+    return False
+
+################################################################################
+def _lire_lots(lignes, indices, executeur, file_lots, arret):
+    """ Découpe les lignes en lots numérotés et les soumet dans l'ordre aux décodeurs
+        Le résultat de chaque soumission est déposé dans la file, suivi de None à la fin des lignes,
+        ou de l'exception rencontrée lors de la lecture """
+    try:
+        lot = []
+        numero_ligne = 1
+        for ligne in lignes:
+            if not ligne:
+                continue
+            lot.append((numero_ligne, ligne))
+            numero_ligne += 1
+            if len(lot) == TAILLE_LOT:
+                if not _deposer(file_lots, executeur.submit(_decoder_lot, lot, indices), arret):
+                    return
+                lot = []
+        if lot:
+            if not _deposer(file_lots, executeur.submit(_decoder_lot, lot, indices), arret):
+                return
+        _deposer(file_lots, None, arret)
+    except Exception as erreur: # pylint: disable=W0703
+        # L'erreur est retransmise au consommateur, après les lignes lues avant elle :
+        if lot:
+            if not _deposer(file_lots, executeur.submit(_decoder_lot, lot, indices), arret):
+                return
+        _deposer(file_lots, erreur, arret)
+
+################################################################################
+def _initialiser_decodeur():
+    """ Laisse au seul processus principal le traitement du contrôle-C """
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+################################################################################
+def _lire_connexions_en_parallele(lignes, indices, decodeurs):
+    """ Générateur des connexions décodées par un ensemble de processus en parallèle de la lecture
+        Les lots sont consommés dans l'ordre de lecture, et les messages de chaque ligne sont émis
+        juste avant de restituer sa connexion : connexions, messages et erreurs se succèdent
+        dans le même ordre qu'en lecture séquentielle """
+    file_lots = queue.Queue(maxsize=2 * decodeurs)
+    arret = threading.Event()
+    with concurrent.futures.ProcessPoolExecutor(
+        max_workers=decodeurs,
+        initializer=_initialiser_decodeur
+    ) as executeur:
+        lecteur = threading.Thread(
+            target=_lire_lots,
+            args=(lignes, indices, executeur, file_lots, arret),
+            daemon=True
+        )
+        lecteur.start()
+        try:
+            while True:
+                element = file_lots.get()
+                if element is None:
+                    break
+                if isinstance(element, Exception):
+                    raise element
+                for messages, champs, erreur in element.result():
+                    for niveau, message in messages:
+                        logging.log(niveau, message)
+                    if erreur is not None:
+                        raise erreur
+                    if champs is not None:
+                        yield Connexion(*champs)
+        finally:
+            arret.set()
+            lecteur.join()
+            executeur.shutdown(cancel_futures=True)
+
+################################################################################
+def lire_connexions(source, afficher=False, decodeurs=0):
+    """ Générateur des connexions contenues dans un journal d'audit
+        La source peut être un nom de fichier, un fichier ouvert ou tout itérable de lignes.
+        Avec des décodeurs, la lecture, le décodage et la consommation des connexions se font
+        en parallèle (sauf en cas d'affichage du contenu, qui reste séquentiel) """
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, "r", encoding="utf-8", buffering=TAILLE_TAMPON) as fichier:
+            yield from lire_connexions(fichier, afficher, decodeurs)
+        return
+
+    lignes = csv.reader(source, delimiter=DELIMITER)
+    entete = next(lignes, None)
+    if entete is None:
+        # Source vide :
+        return
+    indices = indexer_colonnes(entete)
+
+    if decodeurs and not afficher:
+        yield from _lire_connexions_en_parallele(lignes, indices, decodeurs)
+        return
+
+    numero_ligne = 1
+    for ligne in lignes:
+        if not ligne:
+            continue
+        connexion = _decoder_champs(numero_ligne, ligne, indices, afficher)
+        if connexion is not None:
+            yield connexion
+        numero_ligne += 1
+
+################################################################################
+class Agregateur:
+    """ Construit incrémentalement les structures des réunions/organisateurs et des participants """
+
+    def __init__(self):
+        self.organisateurs = {}
+        self.participants = {}
+
+    def ajouter(self, connexion):
+        """ Ajoute une connexion aux structures """
+        organisateurs = self.organisateurs
+        participants = self.participants
+        numero_ligne = connexion.numero_ligne
+        id_reunion = connexion.id_reunion
+        email_organisateur = connexion.email_organisateur
+        id_organisateur = connexion.id_organisateur
+        id_organisation_organisateur = connexion.id_organisation_organisateur
+        type_reunion = connexion.type_reunion
+        type_cle = connexion.type_cle
+        cle_participant = connexion.cle_participant
+        id_organisation_participant = connexion.id_organisation_participant
+        propriete = connexion.propriete
+        debut = connexion.debut
+        fin = connexion.fin
+        adresse_ip = connexion.adresse_ip
+        materiel = connexion.materiel
 
         if id_reunion in organisateurs:
             if email_organisateur != organisateurs[id_reunion]["email_organisateur"]:
@@ -384,9 +865,69 @@ def extraire_reunions(fichier, afficher):
             participant = {cle_participant: [details_connexion]}
             participants[id_reunion] = participant
 
-        numero_ligne += 1
+    def ajouter_tout(self, connexions):
+        """ Ajoute un ensemble de connexions aux structures """
+        for connexion in connexions:
+            self.ajouter(connexion)
 
-    return organisateurs, participants
+    def resultats(self):
+        """ Retourne les structures des réunions/organisateurs et des participants """
+        return self.organisateurs, self.participants
+
+################################################################################
+def extraire_reunions(fichier, afficher, decodeurs=0):
+    """ Retourne des structures contenant la liste des réunions/organisateurs et des participants
+        Vérifie au passage la présence de valeurs inhabituelles dans les champs """
+    agregateur = Agregateur()
+    agregateur.ajouter_tout(lire_connexions(fichier, afficher, decodeurs))
+    return agregateur.resultats()
+
+################################################################################
+def partitionner_connexions(connexions, nombre_partitions, repertoire):
+    """ Répartit les connexions dans des fichiers temporaires selon l'identifiant de leur réunion
+        et retourne les noms de ces fichiers
+        Les connexions y sont écrites en JSON, une par ligne, pour conserver le type des valeurs """
+    noms_fichiers = [
+        os.path.join(repertoire, f"partition{i}.jsonl") for i in range(nombre_partitions)
+    ]
+    champs = operator.attrgetter(*Connexion.__slots__)
+    fichiers = []
+    try:
+        for nom_fichier in noms_fichiers:
+            fichiers.append(open(nom_fichier, "w", encoding="utf-8"))
+
+        for connexion in connexions:
+            # crc32 plutôt que hash() pour une répartition identique d'une exécution à l'autre :
+            partition = zlib.crc32(str(connexion.id_reunion).encode("utf-8")) % nombre_partitions
+            fichiers[partition].write(json.dumps(champs(connexion)) + "\n")
+    finally:
+        for fichier in fichiers:
+            fichier.close()
+
+    return noms_fichiers
+
+################################################################################
+def lire_partition(nom_fichier):
+    """ Générateur des connexions contenues dans un fichier de partition """
+    with open(nom_fichier, "r", encoding="utf-8") as fichier:
+        for ligne in fichier:
+            yield Connexion(*json.loads(ligne))
+
+################################################################################
+def extraire_reunions_partitionnees(fichier, afficher, nombre_partitions, decodeurs=0):
+    """ Générateur des structures de réunions/organisateurs et de participants de chaque partition
+        Seule une partition à la fois est présente en mémoire """
+    with tempfile.TemporaryDirectory(prefix="tala-") as repertoire:
+        noms_fichiers = partitionner_connexions(
+            lire_connexions(fichier, afficher, decodeurs),
+            nombre_partitions,
+            repertoire
+        )
+        for nom_fichier in noms_fichiers:
+            agregateur = Agregateur()
+            agregateur.ajouter_tout(lire_partition(nom_fichier))
+            os.unlink(nom_fichier)
+            yield agregateur.resultats()
 
 ################################################################################
 def charger_uids(nom_fichier):
@@ -404,32 +945,35 @@ def charger_uids(nom_fichier):
     return uids
 
 ################################################################################
-def mettre_a_jour_uids(nom_fichier, organisateurs, uids):
-    """ Met à jour le fichier CSV UID,EMAIL à partir du dictionnaire """
+def ajouter_uids(organisateurs, uids):
+    """ Complète le dictionnaire UID: EMAIL avec les organisateurs et indique s'il a été modifié """
     nouveaux_uids = False
     for id_reunion in organisateurs:
         if organisateurs[id_reunion]["id_organisateur"] not in uids:
             uids[organisateurs[id_reunion]["id_organisateur"]] = organisateurs[id_reunion]["email_organisateur"]
             nouveaux_uids = True
+    return nouveaux_uids
 
-    if nouveaux_uids:
-        with open(nom_fichier, "w", encoding="utf-8") as fichier:
-            for uid in uids:
-                fichier.write(f"{uid},{uids[uid]}\n")
-
-    return uids
+################################################################################
+def ecrire_uids(nom_fichier, uids):
+    """ Écrit le fichier CSV UID,EMAIL à partir du dictionnaire """
+    with open(nom_fichier, "w", encoding="utf-8") as fichier:
+        for uid in uids:
+            fichier.write(f"{uid},{uids[uid]}\n")
 
 ################################################################################
-def lister_organisateurs(reunions):
+def lister_organisateurs(reunions, entete=True):
     """ Lister les réunions au format CSV """
-    print("#meeting_id,organizer_email,organizer_id,organizer_organization,meeting_type,first_join,last_leave,number_attendees")
+    if entete:
+        print("#meeting_id,organizer_email,organizer_id,organizer_organization,meeting_type,first_join,last_leave,number_attendees")
     for k, v in reunions.items():
         print(f'{k},{v["email_organisateur"]},{v["id_organisateur"]},{v["id_organisation"]},{v["type_reunion"]},{v["premier_arrive"]},{v["dernier_parti"]},{len(v["participants"])}')
 
 ################################################################################
-def lister_participants(reunions, uids):
+def lister_participants(reunions, uids, entete=True):
     """ Lister les connexions des participants de réunions au format CSV """
-    print("#meeting_id,attendee_key,attendee_email,key_type,attendee_organization,join_time,leave_time,client_ip,device,property")
+    if entete:
+        print("#meeting_id,attendee_key,attendee_email,key_type,attendee_organization,join_time,leave_time,client_ip,device,property")
     for kr in reunions: # kr = clé de réunion
         for kp in reunions[kr]: # kp = clé de participant
             participant = ""
@@ -439,82 +983,586 @@ def lister_participants(reunions, uids):
                 print(f'{kr},{kp},{participant},{c["type_cle"]},{c["id_organisation"]},{c["debut"]},{c["fin"]},{c["adresse_ip"]},{c["materiel"]},{c["propriete"]}')
 
 ################################################################################
-def lister_deconnexions(organisateurs, participants, uids, filtre):
-    """ Liste les réunions/participants/connexions avec suspicion de déconnexion """
-    reunions_affectees = 0
-    participants_affectes = 0
-    total_participants = 0
+@functools.lru_cache(maxsize=65536)
+def sous_reseau(adresse_ip):
+    """ Retourne le sous-réseau (/24 en IPv4, /64 en IPv6) d'une adresse IP """
+    try:
+        adresse = ipaddress.ip_address(adresse_ip)
+    except ValueError:
+        reseau = "?"
+    else:
+        if adresse.version == 4:
+            reseau = str(ipaddress.ip_network(f"{adresse}/24", strict=False))
+        else:
+            reseau = str(ipaddress.ip_network(f"{adresse}/64", strict=False))
+
+    return reseau
+
+################################################################################
+def nouveau_bilan_deconnexions():
+    """ Retourne une structure vide de cumul des déconnexions """
+    return {
+        "reunions": 0,
+        "reunions_affectees": 0,
+        "participants": 0,
+        "participants_affectes": 0,
+        "incidents": {}, # (sous-réseau, tranche horaire): {"participants": set(), "reunions": set()}
+    }
+
+################################################################################
+def analyser_deconnexions(organisateurs, participants, uids, filtre, ecart, intervalle, bilan):
+    """ Liste les réunions/participants/connexions avec suspicion de déconnexion
+        Une reconnexion est suspecte si elle survient au plus 'ecart' secondes après la fin
+        de la connexion précédente sur le même matériel. Les déconnexions sont cumulées dans
+        'bilan' par sous-réseau et par tranche de 'intervalle' secondes """
+    incidents = bilan["incidents"]
+    bilan["reunions"] += len(participants)
     for id_reunion in participants:
         infos_reunion = False
         reunion_affectee = False
-        total_participants += len(participants[id_reunion])
+        bilan["participants"] += len(participants[id_reunion])
         for cle_participant in participants[id_reunion]:
             infos_participant = False
 
+            # Regroupement des connexions par matériel, avec leurs bornes en secondes :
             devices = {}
             for connexion in participants[id_reunion][cle_participant]:
                 if not filtre or filtre.search(connexion["adresse_ip"]):
                     device = connexion["materiel"]
                     if not device:
                         device = "?"
-                    debut_connexion = re.sub(r".*T", "", connexion["debut"])
-                    fin_connexion = re.sub(r".*T", "", connexion["fin"])
+                    try:
+                        intervalle_connexion = (
+                            convertir_secondes(connexion["debut"]),
+                            convertir_secondes(connexion["fin"]),
+                            connexion
+                        )
+                    except ValueError:
+                        # Connexion impossible à situer dans le temps :
+                        logging.warning(f"Réunion {id_reunion} : connexion de '{cle_participant}' ignorée, début '{connexion['debut']}' ou fin '{connexion['fin']}' incorrect")
+                        continue
                     if device in devices:
-                        devices[device].append(f'    Time: {debut_connexion} - {fin_connexion} / IP address: {connexion["adresse_ip"]:15s} / Device: {connexion["materiel"]} / Property: {connexion["propriete"]}')
+                        devices[device].append(intervalle_connexion)
                     else:
-                        devices[device] = [f'    Time: {debut_connexion} - {fin_connexion} / IP address: {connexion["adresse_ip"]:15s} / Device: {connexion["materiel"]} / Property: {connexion["propriete"]}']
+                        devices[device] = [intervalle_connexion]
 
             participant_affecte = False
-            for device, connexions in devices.items():
-                if len(connexions) > 1:
-                    participant_affecte = True
-                    reunion_affectee = True
-                    if not infos_reunion:
-                        # Informations sur la réunion :
-                        date_reunion = re.sub(r"T.*", "", organisateurs[id_reunion]["premier_arrive"])
-                        debut_reunion = re.sub(r".*T", "", organisateurs[id_reunion]["premier_arrive"])
-                        fin_reunion = re.sub(r".*T", "", organisateurs[id_reunion]["dernier_parti"])
-                        print(f'Meeting ID: {id_reunion} / Type: {organisateurs[id_reunion]["type_reunion"]} / Date: {date_reunion} / Time: {debut_reunion} - {fin_reunion} / #Attendees: {len(organisateurs[id_reunion]["participants"])}')
-                        infos_reunion = True
-
-                    if not infos_participant:
-                        # Informations sur le participant :
-                        if cle_participant in uids:
-                            print(f'  Attendee: {cle_participant} / Key type: {participants[id_reunion][cle_participant][0]["type_cle"]} / Email: {uids[cle_participant]} / Organization ID: {participants[id_reunion][cle_participant][0]["id_organisation"]}')
+            for device, intervalles in devices.items():
+                if len(intervalles) < 2:
+                    continue
+
+                # Recherche des reconnexions rapprochées :
+                intervalles.sort(key=lambda x: (x[0], x[1]))
+                suspectes = set()
+                fin_precedente = intervalles[0][1]
+                indice_precedent = 0
+                for i in range(1, len(intervalles)):
+                    debut, fin, connexion = intervalles[i]
+                    if debut - fin_precedente <= ecart:
+                        suspectes.add(indice_precedent)
+                        suspectes.add(i)
+
+                        # Cumul de la déconnexion par sous-réseau et tranche horaire.
+                        # En cas de chevauchement, la fin de l'ancienne session n'est que son
+                        # expiration : la déconnexion date au plus tard de la reconnexion :
+                        cle_incident = (
+                            sous_reseau(intervalles[indice_precedent][2]["adresse_ip"]),
+                            int(min(debut, fin_precedente) // intervalle)
+                        )
+                        if cle_incident in incidents:
+                            incident = incidents[cle_incident]
                         else:
-                            print(f'  Attendee: {cle_participant} / Key type: {participants[id_reunion][cle_participant][0]["type_cle"]} / Organization ID: {participants[id_reunion][cle_participant][0]["id_organisation"]}')
-                        infos_participant = True
+                            incident = {"participants": set(), "reunions": set()}
+                            incidents[cle_incident] = incident
+                        incident["participants"].add(cle_participant)
+                        incident["reunions"].add(id_reunion)
+
+                    if fin > fin_precedente:
+                        fin_precedente = fin
+                        indice_precedent = i
+
+                if not suspectes:
+                    continue
+
+                participant_affecte = True
+                reunion_affectee = True
+                if not infos_reunion:
+                    # Informations sur la réunion :
+                    date_reunion = re.sub(r"T.*", "", organisateurs[id_reunion]["premier_arrive"])
+                    debut_reunion = re.sub(r".*T", "", organisateurs[id_reunion]["premier_arrive"])
+                    fin_reunion = re.sub(r".*T", "", organisateurs[id_reunion]["dernier_parti"])
+                    print(f'Meeting ID: {id_reunion} / Type: {organisateurs[id_reunion]["type_reunion"]} / Date: {date_reunion} / Time: {debut_reunion} - {fin_reunion} / #Attendees: {len(organisateurs[id_reunion]["participants"])}')
+                    infos_reunion = True
+
+                if not infos_participant:
+                    # Informations sur le participant :
+                    if cle_participant in uids:
+                        print(f'  Attendee: {cle_participant} / Key type: {participants[id_reunion][cle_participant][0]["type_cle"]} / Email: {uids[cle_participant]} / Organization ID: {participants[id_reunion][cle_participant][0]["id_organisation"]}')
+                    else:
+                        print(f'  Attendee: {cle_participant} / Key type: {participants[id_reunion][cle_participant][0]["type_cle"]} / Organization ID: {participants[id_reunion][cle_participant][0]["id_organisation"]}')
+                    infos_participant = True
 
-                    # reconnexions suspectes :
-                    for connexion in connexions:
-                        print(connexion)
-                    print()
+                # reconnexions suspectes :
+                for i in sorted(suspectes):
+                    connexion = intervalles[i][2]
+                    debut_connexion = re.sub(r".*T", "", connexion["debut"])
+                    fin_connexion = re.sub(r".*T", "", connexion["fin"])
+                    print(f'    Time: {debut_connexion} - {fin_connexion} / IP address: {connexion["adresse_ip"]:15s} / Device: {connexion["materiel"]} / Property: {connexion["propriete"]}')
+                print()
             if participant_affecte:
-                participants_affectes += 1
+                bilan["participants_affectes"] += 1
         if reunion_affectee:
-            reunions_affectees += 1
+            bilan["reunions_affectees"] += 1
+
+    return bilan
+
+################################################################################
+def afficher_bilan_deconnexions(bilan, intervalle):
+    """ Affiche les totaux et les incidents regroupés par sous-réseau et tranche horaire """
+    print("=====")
+    print(f'{bilan["reunions_affectees"]} meetings affected out of {bilan["reunions"]} ({100 * bilan["reunions_affectees"] / max(bilan["reunions"], 1):.1f}%)')
+    print(f'{bilan["participants_affectes"]} attendees affected out of {bilan["participants"]} ({100 * bilan["participants_affectes"] / max(bilan["participants"], 1):.1f}%)')
+
+    incidents = [
+        (tranche, reseau, incident)
+        for (reseau, tranche), incident in bilan["incidents"].items()
+        if len(incident["participants"]) >= SEUIL_INCIDENT
+    ]
+    if incidents:
+        print("=====")
+        for tranche, reseau, incident in sorted(incidents, key=lambda x: (x[0], x[1])):
+            debut_tranche = datetime.datetime.fromtimestamp(tranche * intervalle)
+            fin_tranche = datetime.datetime.fromtimestamp((tranche + 1) * intervalle)
+            print(f'Incident: Subnet: {reseau} / Date: {debut_tranche.strftime("%Y-%m-%d")} / Time: {debut_tranche.strftime("%H:%M:%S")} - {fin_tranche.strftime("%H:%M:%S")} / #Attendees: {len(incident["participants"])} / #Meetings: {len(incident["reunions"])}')
+
+################################################################################
+def regrouper_connexions(connexions, champs, mesures):
+    """ Lister au format CSV les mesures de connexions regroupées selon les valeurs de champs
+        Les champs sont désignés par les noms de colonnes de CHAMPS_REGROUPEMENT """
+    attributs = [CHAMPS_REGROUPEMENT[champ] for champ in champs]
+    if len(attributs) == 1:
+        extraire_valeur = operator.attrgetter(attributs[0])
+
+        def extraire_cle(connexion):
+            """ Retourne la clé de regroupement d'une connexion """
+            return (extraire_valeur(connexion),)
+    else:
+        extraire_cle = operator.attrgetter(*attributs)
+    calculer_distincts = "distinct" in mesures
+    calculer_durees = "sum_duration" in mesures
+
+    # groupes = {clé: [nombre de connexions, participants distincts, durée cumulée]}
+    groupes = {}
+    for connexion in connexions:
+        # Les valeurs non textuelles des données JSON (null, nombres) sont converties :
+        cle = tuple(map(str, extraire_cle(connexion)))
+        groupe = groupes.get(cle)
+        if groupe is None:
+            cle = tuple(sys.intern(valeur) for valeur in cle)
+            groupe = [0, set(), 0]
+            groupes[cle] = groupe
+        groupe[0] += 1
+        if calculer_distincts:
+            groupe[1].add(connexion.cle_participant)
+        if calculer_durees and connexion.debut and connexion.fin:
+            try:
+                groupe[2] += convertir_secondes(connexion.fin) - convertir_secondes(connexion.debut)
+            except ValueError:
+                logging.warning(f"Ligne {connexion.numero_ligne} : durée de connexion incalculable")
+
+    print("#" + ",".join(champs + mesures))
+    for cle, groupe in groupes.items():
+        valeurs = {
+            "count": groupe[0],
+            "distinct": len(groupe[1]),
+            "sum_duration": int(groupe[2]),
+        }
+        print(",".join(list(cle) + [str(valeurs[mesure]) for mesure in mesures]))
+
+################################################################################
+def _hacher(valeur):
+    """ Retourne un condensat de 64 bits, stable d'une exécution à l'autre, d'une valeur """
+    return int.from_bytes(hashlib.blake2b(str(valeur).encode("utf-8"), digest_size=8).digest(), "little")
+
+################################################################################
+def _compteur_groupe(groupes, groupe):
+    """ Retourne le compteur HyperLogLog d'un groupe, en limitant leur nombre à NOMBRE_MAX_GROUPES """
+    groupe = str(groupe) if groupe else "?"
+    if groupe not in groupes:
+        if len(groupes) >= NOMBRE_MAX_GROUPES:
+            groupe = AUTRES_GROUPES
+        if groupe not in groupes:
+            groupes[groupe] = HyperLogLog()
+    return groupes[groupe]
+
+################################################################################
+class HyperLogLog:
+    """ Estimation du nombre de valeurs distinctes en mémoire fixe (2^precision octets)
+        L'erreur type relative est de 1,04 / sqrt(2^precision), soit 1,6 % pour une précision de 12 """
+
+    def __init__(self, precision=12):
+        self.precision = precision
+        self.registres = bytearray(1 << precision)
+
+    def ajouter(self, condensat):
+        """ Prend en compte le condensat de 64 bits d'une valeur """
+        indice = condensat >> (64 - self.precision)
+        reste = condensat & ((1 << (64 - self.precision)) - 1)
+        rang = 64 - self.precision - reste.bit_length() + 1
+        if rang > self.registres[indice]:
+            self.registres[indice] = rang
+
+    def estimer(self):
+        """ Retourne le nombre estimé de valeurs distinctes """
+        m = len(self.registres)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        estimation = alpha * m * m / sum(2.0 ** -registre for registre in self.registres)
+        vides = self.registres.count(0)
+        if estimation <= 2.5 * m and vides:
+            # Correction pour les petits effectifs (comptage linéaire) :
+            estimation = m * math.log(m / vides)
+        return round(estimation)
 
+################################################################################
+class CountMinSketch:
+    """ Estimation du nombre d'occurrences de valeurs en mémoire fixe
+        L'estimation n'est jamais inférieure à la valeur exacte et ne la dépasse pas de plus de
+        epsilon * (nombre total d'occurrences) avec une probabilité de 1 - delta """
+
+    def __init__(self, epsilon=0.001, delta=0.01):
+        self.largeur = math.ceil(math.e / epsilon)
+        self.profondeur = math.ceil(math.log(1 / delta))
+        self.compteurs = [[0] * self.largeur for _ in range(self.profondeur)]
+
+    def ajouter(self, valeur):
+        """ Compte une occurrence d'une valeur et retourne son nombre estimé d'occurrences """
+        condensat = hashlib.blake2b(valeur.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(condensat[:8], "little")
+        h2 = int.from_bytes(condensat[8:], "little")
+        estimation = None
+        for i, ligne in enumerate(self.compteurs):
+            j = (h1 + i * h2) % self.largeur
+            ligne[j] += 1
+            if estimation is None or ligne[j] < estimation:
+                estimation = ligne[j]
+        return estimation
+
+################################################################################
+class Quantiles:
+    """ Estimation des quantiles d'une distribution de valeurs positives en mémoire fixe
+        Les valeurs sont comptées dans des intervalles de progression géométrique, ce qui garantit
+        une erreur relative d'au plus 'precision' sur chaque quantile retourné """
+
+    def __init__(self, precision=0.01):
+        self.gamma = (1 + precision) / (1 - precision)
+        self.log_gamma = math.log(self.gamma)
+        self.intervalles = {}
+        self.zeros = 0
+        self.total = 0
+        self.maximum = 0
+
+    def ajouter(self, valeur):
+        """ Prend en compte une valeur """
+        self.total += 1
+        if valeur <= 0:
+            self.zeros += 1
+            return
+        if valeur > self.maximum:
+            self.maximum = valeur
+        indice = math.ceil(math.log(valeur) / self.log_gamma)
+        self.intervalles[indice] = self.intervalles.get(indice, 0) + 1
+
+    def quantile(self, q):
+        """ Retourne la valeur estimée du quantile q (entre 0 et 1) """
+        if not self.total:
+            return 0
+        rang = q * (self.total - 1)
+        cumul = self.zeros
+        if rang < cumul:
+            return 0
+        for indice in sorted(self.intervalles):
+            cumul += self.intervalles[indice]
+            if rang < cumul:
+                return 2 * self.gamma ** indice / (self.gamma + 1)
+        return self.maximum
+
+################################################################################
+def resumer_connexions(connexions, nombre_principaux=10):
+    """ Affiche des statistiques approximatives, calculées en mémoire fixe, sur des connexions
+        Au-delà de NOMBRE_MAX_GROUPES organisations ou matériels, les suivants sont cumulés """
+    nombre_connexions = 0
+    reunions = HyperLogLog()
+    participants = HyperLogLog()
+    participants_par_organisation = {}
+    adresses_par_materiel = {}
+    connexions_par_participant = CountMinSketch()
+    principaux_participants = {}
+    durees = Quantiles()
+
+    for connexion in connexions:
+        nombre_connexions += 1
+        condensat_participant = _hacher(connexion.cle_participant)
+        reunions.ajouter(_hacher(connexion.id_reunion))
+        participants.ajouter(condensat_participant)
+
+        _compteur_groupe(participants_par_organisation, connexion.id_organisation_organisateur).ajouter(condensat_participant)
+        _compteur_groupe(adresses_par_materiel, connexion.materiel).ajouter(_hacher(connexion.adresse_ip))
+
+        # Seuls les participants les plus fréquents sont conservés :
+        participant = str(connexion.cle_participant)
+        estimation = connexions_par_participant.ajouter(participant)
+        if participant in principaux_participants \
+        or len(principaux_participants) < nombre_principaux:
+            principaux_participants[participant] = estimation
+        else:
+            moins_frequent = min(principaux_participants, key=principaux_participants.get)
+            if estimation > principaux_participants[moins_frequent]:
+                del principaux_participants[moins_frequent]
+                principaux_participants[participant] = estimation
+
+        if connexion.debut and connexion.fin:
+            try:
+                durees.ajouter(convertir_secondes(connexion.fin) - convertir_secondes(connexion.debut))
+            except ValueError:
+                logging.warning(f"Ligne {connexion.numero_ligne} : durée de connexion incalculable")
+
+    print(f"Connections: {nombre_connexions}")
+    print(f"Distinct meetings: ~{reunions.estimer()}")
+    print(f"Distinct attendees: ~{participants.estimer()}")
+    print(f"Connection duration (seconds): p50: ~{durees.quantile(0.5):.0f} / p90: ~{durees.quantile(0.9):.0f} / p99: ~{durees.quantile(0.99):.0f} / max: {durees.maximum:.0f}")
+    print("=====")
+    print("Distinct attendees per organizer organization:")
+    for organisation, sketch in sorted(participants_par_organisation.items()):
+        print(f"  {organisation}: ~{sketch.estimer()}")
     print("=====")
-    print(f"{reunions_affectees} meetings affected out of {len(participants)} ({100 * reunions_affectees / len(participants):.1f}%)")
-    print(f"{participants_affectes} attendees affected out of {total_participants} ({100 * participants_affectes / total_participants:.1f}%)")
+    print("Distinct IP addresses per device:")
+    for materiel, sketch in sorted(adresses_par_materiel.items()):
+        print(f"  {materiel}: ~{sketch.estimer()}")
+    print("=====")
+    print("Most frequent attendees by number of connections:")
+    for participant, estimation in sorted(principaux_participants.items(), key=lambda x: -x[1]):
+        print(f"  {participant}: ~{estimation}")
 
 ################################################################################
 def traiter_fichier(fichier, uids):
     """ Traite une source et retourne les uids mis à jour """
-    organisateurs, participants = extraire_reunions(fichier, parametres["Afficher contenu"])
+    if parametres["Resume approximatif"]:
+        resumer_connexions(lire_connexions(fichier, decodeurs=parametres["Decodeurs"]))
+        return uids
+
+    if parametres["Regroupement"]:
+        regrouper_connexions(
+            lire_connexions(fichier, decodeurs=parametres["Decodeurs"]),
+            parametres["Regroupement"],
+            parametres["Mesures"]
+        )
+        return uids
+
+    if parametres["Partitions"] > 1:
+        partitions = extraire_reunions_partitionnees(
+            fichier,
+            parametres["Afficher contenu"],
+            parametres["Partitions"],
+            parametres["Decodeurs"]
+        )
+    else:
+        partitions = [
+            extraire_reunions(fichier, parametres["Afficher contenu"], parametres["Decodeurs"])
+        ]
 
-    if parametres["Base utilisateurs"]:
-        uids = mettre_a_jour_uids(parametres["Base utilisateurs"], organisateurs, uids)
+    bilan = nouveau_bilan_deconnexions()
+    entete = True
+    nouveaux_uids = False
+    for organisateurs, participants in partitions:
+        if parametres["Base utilisateurs"]:
+            nouveaux_uids = ajouter_uids(organisateurs, uids) or nouveaux_uids
+
+        if parametres["Lister organisateurs"]:
+            lister_organisateurs(organisateurs, entete)
+        elif parametres["Lister participants"]:
+            lister_participants(participants, uids, entete)
+        elif parametres["Lister deconnexions"]:
+            analyser_deconnexions(
+                organisateurs,
+                participants,
+                uids,
+                parametres["Filtre adresses"],
+                parametres["Ecart reconnexion"],
+                parametres["Intervalle incidents"],
+                bilan
+            )
+        entete = False
+
+    # La base utilisateurs n'est réécrite qu'une fois toutes les partitions traitées :
+    if nouveaux_uids:
+        ecrire_uids(parametres["Base utilisateurs"], uids)
 
-    if parametres["Lister organisateurs"]:
-        lister_organisateurs(organisateurs)
-    elif parametres["Lister participants"]:
-        lister_participants(participants, uids)
-    elif parametres["Lister deconnexions"]:
-        lister_deconnexions(organisateurs, participants, uids, parametres["Filtre adresses"])
+    if parametres["Lister deconnexions"]:
+        afficher_bilan_deconnexions(bilan, parametres["Intervalle incidents"])
 
     return uids
 
+################################################################################
+class _GestionnaireRequete(socketserver.StreamRequestHandler):
+    """ Traitement d'une requête client par le serveur
+        La requête est une ligne JSON contenant les paramètres et les noms de fichiers
+        à traiter, éventuellement suivie des données à traiter s'il n'y a pas de fichiers.
+        Le résultat du traitement est renvoyé au client, suivi de FIN_REPONSE et d'une ligne
+        d'état JSON {"erreur": message} (message vide en cas de succès) """
+
+    def handle(self):
+        """ Traite une requête avec les paramètres du client """
+        # pylint: disable=C0103
+        global parametres
+        # pylint: enable=C0103
+
+        sortie = io.TextIOWrapper(self.wfile, encoding="utf-8")
+        try:
+            requete = json.loads(self.rfile.readline().decode("utf-8"))
+        except ValueError as erreur:
+            logging.error(f"Invalid request: {erreur}")
+            self._terminer_reponse(sortie, f"Invalid request: {erreur}")
+            return
+
+        parametres_serveur = parametres.copy()
+        entree = io.TextIOWrapper(self.rfile, encoding="utf-8")
+        message_erreur = ""
+        try:
+            for parametre in PARAMETRES_REQUETE:
+                if parametre in requete.get("parametres", {}):
+                    parametres[parametre] = requete["parametres"][parametre]
+            if parametres["Filtre adresses"]:
+                parametres["Filtre adresses"] = re.compile(parametres["Filtre adresses"])
+
+            with contextlib.redirect_stdout(sortie):
+                if requete.get("fichiers"):
+                    for nom_fichier in requete["fichiers"]:
+                        with open(nom_fichier, "r", encoding="utf-8", buffering=TAILLE_TAMPON) as fichier:
+                            self.server.uids = traiter_fichier(fichier, self.server.uids)
+                else:
+                    self.server.uids = traiter_fichier(entree, self.server.uids)
+        except Exception as erreur: # pylint: disable=W0703
+            # Toute erreur doit être signalée au client dans la ligne d'état :
+            logging.error(f"Request failed: {erreur!r}")
+            message_erreur = f"Request failed: {erreur!r}"
+        finally:
+            parametres = parametres_serveur
+            entree.detach()
+        self._terminer_reponse(sortie, message_erreur)
+
+    @staticmethod
+    def _terminer_reponse(sortie, message_erreur):
+        """ Envoie la ligne d'état de la réponse au client """
+        try:
+            sortie.write(FIN_REPONSE + json.dumps({"erreur": message_erreur}) + "\n")
+            sortie.flush()
+        except OSError as erreur:
+            logging.error(f"Cannot reply to client: {erreur}")
+        sortie.detach()
+
+    def finish(self):
+        """ Ignore les données non lues avant de fermer la connexion, pour que le client
+            reçoive la ligne d'état plutôt qu'une réinitialisation de la connexion """
+        try:
+            while self.rfile.read(1024 * 1024):
+                pass
+        except OSError:
+            pass
+        super().finish()
+
+################################################################################
+def servir(nom_socket, uids):
+    """ Traite les requêtes des clients en conservant la base utilisateurs et les caches
+        Le socket n'est accessible qu'à l'utilisateur du serveur, qui peut lire tout fichier
+        désigné par un client """
+    if os.path.exists(nom_socket):
+        os.unlink(nom_socket)
+
+    # Le masque évite que le socket soit accessible aux autres utilisateurs avant le chmod :
+    ancien_masque = os.umask(0o177)
+    try:
+        serveur = socketserver.UnixStreamServer(nom_socket, _GestionnaireRequete)
+    finally:
+        os.umask(ancien_masque)
+
+    with serveur:
+        os.chmod(nom_socket, 0o600)
+        serveur.uids = uids
+        try:
+            serveur.serve_forever()
+        finally:
+            os.unlink(nom_socket)
+
+################################################################################
+def _envoyer_donnees(connexion, entree):
+    """ Envoie des données au serveur, puis signale leur fin
+        Si le serveur a déjà fermé la connexion (données rejetées), l'envoi est abandonné
+        et l'erreur est signalée par sa ligne d'état """
+    try:
+        while True:
+            donnees = entree.read(1024 * 1024)
+            if not donnees:
+                break
+            connexion.sendall(donnees)
+        connexion.shutdown(socket.SHUT_WR)
+    except OSError:
+        pass
+
+################################################################################
+def interroger_serveur(nom_socket, noms_fichiers):
+    """ Fait traiter des fichiers (ou l'entrée standard) par le serveur et affiche le résultat
+        Retourne 0 en cas de succès, 1 si le serveur signale une erreur """
+    requete = {
+        "parametres": {parametre: parametres[parametre] for parametre in PARAMETRES_REQUETE},
+        "fichiers": [os.path.abspath(nom_fichier) for nom_fichier in noms_fichiers],
+    }
+    if requete["parametres"]["Filtre adresses"]:
+        requete["parametres"]["Filtre adresses"] = requete["parametres"]["Filtre adresses"].pattern
+
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as connexion:
+        connexion.connect(nom_socket)
+        connexion.sendall((json.dumps(requete) + "\n").encode("utf-8"))
+
+        # Les données sont envoyées en parallèle de la réception du résultat,
+        # le serveur pouvant commencer à répondre avant la fin de la lecture :
+        if noms_fichiers:
+            connexion.shutdown(socket.SHUT_WR)
+            envoi = None
+        else:
+            envoi = threading.Thread(target=_envoyer_donnees, args=(connexion, sys.stdin.buffer))
+            envoi.start()
+
+        # Tout ce qui suit le dernier marqueur reçu est retenu, jusqu'à la ligne d'état finale :
+        marqueur = FIN_REPONSE.encode("utf-8")
+        reste = b""
+        sys.stdout.flush()
+        while True:
+            donnees = connexion.recv(1024 * 1024)
+            if not donnees:
+                break
+            donnees = reste + donnees
+            position = donnees.rfind(marqueur)
+            if position < 0:
+                reste = b""
+            else:
+                reste = donnees[position:]
+                donnees = donnees[:position]
+            sys.stdout.buffer.write(donnees)
+        sys.stdout.buffer.flush()
+
+        if envoi:
+            envoi.join()
+
+    try:
+        etat = json.loads(reste[len(marqueur):].decode("utf-8"))
+    except ValueError:
+        logging.error("Incomplete response from server")
+        return 1
+    if etat.get("erreur"):
+        logging.error(f"Server: {etat['erreur']}")
+        return 1
+    return 0
+
 ################################################################################
 def main():
     """ Point d'entrée du programme """
@@ -526,16 +1574,43 @@ def main():
 
     exit_status = 0
 
+    if parametres["Socket client"]:
+        # Le traitement est délégué au serveur :
+        if parametres["Base utilisateurs"]:
+            logging.warning("The users database option is ignored: the server's one is used")
+        noms_fichiers = []
+        for argument in arguments:
+            if os.path.isfile(argument):
+                noms_fichiers.append(argument)
+            else:
+                logging.error(f"'{argument}' is not a file name")
+                exit_status += 1
+        if noms_fichiers or not arguments:
+            try:
+                exit_status += interroger_serveur(parametres["Socket client"], noms_fichiers)
+            except OSError as erreur:
+                logging.critical(f"Cannot connect to server: {erreur}")
+                sys.exit(1)
+        sys.exit(exit_status)
+
     uids = {}
     if parametres["Base utilisateurs"]:
         uids = charger_uids(parametres["Base utilisateurs"])
 
+    if parametres["Socket serveur"]:
+        servir(parametres["Socket serveur"], uids)
+        sys.exit(0)
+
     if arguments:
         for argument in arguments:
             if os.path.isfile(argument):
                 # Traitement du fichier :
-                with open(argument, "r", encoding="utf-8") as fichier:
-                    uids = traiter_fichier(fichier, uids)
+                with open(argument, "r", encoding="utf-8", buffering=TAILLE_TAMPON) as fichier:
+                    try:
+                        uids = traiter_fichier(fichier, uids)
+                    except EnteteIncorrecte as erreur:
+                        logging.error(f"'{argument}': {erreur}")
+                        exit_status += 1
 
             else:
                 logging.error(f"'{argument}' is not a file name")
@@ -543,7 +1618,11 @@ def main():
     else:
         # Traitement des données sur l'entrée standard :
         fichier = sys.stdin
-        uids = traiter_fichier(fichier, uids)
+        try:
+            uids = traiter_fichier(fichier, uids)
+        except EnteteIncorrecte as erreur:
+            logging.error(f"stdin: {erreur}")
+            exit_status += 1
 
     sys.exit(exit_status)
 
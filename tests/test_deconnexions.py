@@ -0,0 +1,55 @@
+""" Tests de la détection des déconnexions de tala
+Licence: BSD 3 clauses (see https://opensource.org/licenses/BSD-3-Clause)
+"""
+
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import tala # pylint: disable=C0413
+
+################################################################################
+def _ligne(id_reunion, participant, adresse_ip, debut, fin):
+    """ Retourne une ligne de journal d'audit au format CSV """
+    details = {
+        "MeetingDetailId": id_reunion,
+        "UserId": "organisateur@example.com",
+        "UserKey": "organisateur",
+        "OrganizationId": "organisation",
+        "ItemName": "ScheduledMeeting",
+        "Attendees": [{"RecipientType": "User", "UserObjectId": participant, "OrganizationId": "organisation"}],
+        "JoinTime": debut,
+        "LeaveTime": fin,
+        "ClientIP": adresse_ip,
+        "DeviceInformation": "PC",
+    }
+    audit = json.dumps(details).replace('"', '""')
+    return f'{debut},organisateur@example.com,MeetingParticipantDetail,"{audit}"\n'
+
+################################################################################
+def test_incident_reconnexions_chevauchantes(capsys):
+    """ Des reconnexions simultanées chevauchant l'ancienne session forment un même incident,
+        daté de la reconnexion et non de l'expiration de l'ancienne session """
+    lignes = [
+        "CreationDate,UserId,Operation,AuditData\n",
+        _ligne("A", "u1", "10.9.9.1", "2024-04-12T10:00:00", "2024-04-12T10:44:50"),
+        _ligne("A", "u1", "10.9.9.1", "2024-04-12T10:42:30", "2024-04-12T11:00:00"),
+        _ligne("B", "u2", "10.9.9.2", "2024-04-12T10:05:00", "2024-04-12T10:46:10"),
+        _ligne("B", "u2", "10.9.9.2", "2024-04-12T10:42:40", "2024-04-12T11:00:00"),
+    ]
+    organisateurs, participants = tala.extraire_reunions(lignes, False)
+    bilan = tala.nouveau_bilan_deconnexions()
+    tala.analyser_deconnexions(organisateurs, participants, {}, None, 300, 300, bilan)
+
+    incidents = [
+        (reseau, len(incident["participants"]), len(incident["reunions"]))
+        for (reseau, _), incident in bilan["incidents"].items()
+    ]
+    assert incidents == [("10.9.9.0/24", 2, 2)]
+    assert bilan["participants_affectes"] == 2
+
+    # Chaque connexion suspecte n'est affichée qu'une fois :
+    sortie = capsys.readouterr().out
+    assert sortie.count("Time: 10:00:00 - 10:44:50") == 1
@@ -0,0 +1,76 @@
+""" Tests des estimateurs approximatifs de tala contre les valeurs exactes
+Licence: BSD 3 clauses (see https://opensource.org/licenses/BSD-3-Clause)
+"""
+
+import collections
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import tala # pylint: disable=C0413
+
+################################################################################
+def test_hyperloglog_erreur_relative():
+    """ L'erreur relative reste sous 3 erreurs types (3 x 1,6 %) """
+    for nombre in (100, 1000, 10000, 200000):
+        compteur = tala.HyperLogLog()
+        for i in range(nombre):
+            compteur.ajouter(tala._hacher(f"valeur{i}")) # pylint: disable=W0212
+        assert abs(compteur.estimer() - nombre) <= 0.05 * nombre
+
+################################################################################
+def test_hyperloglog_doublons():
+    """ Les valeurs répétées ne sont comptées qu'une fois """
+    compteur = tala.HyperLogLog()
+    for _ in range(10):
+        for i in range(5000):
+            compteur.ajouter(tala._hacher(f"valeur{i}")) # pylint: disable=W0212
+    assert abs(compteur.estimer() - 5000) <= 0.05 * 5000
+
+################################################################################
+def test_count_min_sketch_bornes():
+    """ Les estimations ne sont jamais inférieures aux valeurs exactes,
+        et les dépassent d'au plus epsilon x total pour au moins 1 - delta des valeurs """
+    generateur = random.Random(1)
+    valeurs = [f"participant{int(generateur.paretovariate(1.2))}" for _ in range(100000)]
+    exacts = collections.Counter()
+    estimations = {}
+    sketch = tala.CountMinSketch(epsilon=0.001, delta=0.01)
+    for valeur in valeurs:
+        exacts[valeur] += 1
+        estimations[valeur] = sketch.ajouter(valeur)
+
+    depassements = 0
+    for valeur, exact in exacts.items():
+        assert estimations[valeur] >= exact
+        if estimations[valeur] - exact > 0.001 * len(valeurs):
+            depassements += 1
+    assert depassements <= 0.01 * len(exacts)
+
+################################################################################
+def test_quantiles_erreur_relative():
+    """ Chaque quantile est à moins de 1 % de la valeur exacte de même rang """
+    generateur = random.Random(2)
+    valeurs = [0] * 500 + [generateur.lognormvariate(7, 1.5) for _ in range(50000)]
+    quantiles = tala.Quantiles(precision=0.01)
+    for valeur in valeurs:
+        quantiles.ajouter(valeur)
+
+    valeurs.sort()
+    for q in (0.001, 0.01, 0.1, 0.25, 0.5, 0.75, 0.9, 0.99, 0.999, 1):
+        exact = valeurs[int(q * (len(valeurs) - 1))]
+        if exact == 0:
+            assert quantiles.quantile(q) == 0
+        else:
+            assert abs(quantiles.quantile(q) - exact) <= 0.01 * exact
+
+################################################################################
+def test_nombre_de_groupes_borne():
+    """ Le nombre de compteurs par groupe ne croît pas avec le nombre de groupes distincts """
+    groupes = {}
+    for i in range(10 * tala.NOMBRE_MAX_GROUPES):
+        tala._compteur_groupe(groupes, f"materiel{i}").ajouter(i) # pylint: disable=W0212
+    assert len(groupes) == tala.NOMBRE_MAX_GROUPES + 1
+    assert tala.AUTRES_GROUPES in groupes